@@ -71,6 +71,8 @@ class OffsetRecordingProtocol(TProtocol.TProtocolBase):
         TType.LIST: "list",
     }
 
+    complex_type_ids = frozenset({TType.STRUCT, TType.MAP, TType.SET, TType.LIST})
+
     enum_map: dict = {
         ColumnMetaData: {
             "codec": CompressionCodec,
@@ -290,7 +292,7 @@ class OffsetRecordingProtocol(TProtocol.TProtocolBase):
         raise RuntimeError(f"unsupported transport: {self.trans}")
 
     def _is_complex_type(self, type_id: int) -> bool:
-        return type_id in {TType.STRUCT, TType.MAP, TType.SET, TType.LIST}
+        return type_id in self.complex_type_ids
 
     def _has_parent(self, predicate: Any) -> bool:
         return bool(self._parents) and predicate(self._parents[-1])
@@ -679,12 +681,17 @@ def get_summary(footer: dict, segments: list[dict]) -> dict[str, Any]:
     return summary
 
 
+_page_detail_segment_names = frozenset(
+    ("page", "column_index", "offset_index", "bloom_filter")
+)
+
+
 def get_pages(
     segments: list[dict], column_chunk_data_offsets: dict[str, list[dict]]
 ) -> list[dict]:
     page_offset_map: dict[int, Any] = {}
     for s in segments:
-        if s["name"] in ("page", "column_index", "offset_index", "bloom_filter"):
+        if s["name"] in _page_detail_segment_names:
             page_offset_map[s["offset"]] = segment_to_json(s)
     column_pages = []
 
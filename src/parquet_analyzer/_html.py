@@ -1,22 +1,62 @@
 import json
 import logging
-import pathlib
+import os
 import struct
 from dataclasses import dataclass
 from decimal import Decimal
+from functools import lru_cache
 from typing import Any, Tuple
 
-from jinja2 import Environment, PackageLoader, select_autoescape
+from jinja2 import (
+    Environment,
+    FileSystemBytecodeCache,
+    PackageLoader,
+    select_autoescape,
+)
+from jinja2.bccache import Bucket
 
 logger = logging.getLogger(__name__)
 
+
+class _BytecodeCache(FileSystemBytecodeCache):
+    # The cache is only an optimization, so a cache file that cannot be read
+    # or written falls back to compiling the template instead of failing
+    def load_bytecode(self, bucket: Bucket) -> None:
+        try:
+            super().load_bytecode(bucket)
+        except OSError:
+            logger.debug("Could not read template bytecode cache", exc_info=True)
+
+    def dump_bytecode(self, bucket: Bucket) -> None:
+        try:
+            super().dump_bytecode(bucket)
+        except OSError:
+            logger.debug("Could not write template bytecode cache", exc_info=True)
+
+
 env = Environment(
     loader=PackageLoader("parquet_analyzer"),
     autoescape=select_autoescape(["html", "xml"]),
     trim_blocks=True,
     lstrip_blocks=True,
+    # Templates ship inside the package and do not change while it runs
+    auto_reload=False,
 )
 
+
+def _attach_bytecode_cache() -> None:
+    # Every CLI run starts with a cold environment, so keep the compiled
+    # templates in Jinja's per-user cache directory under the system temp dir.
+    # This runs on the first render rather than at import, so the JSON output
+    # modes never create the cache directory.
+    if env.bytecode_cache is not None:
+        return
+    try:
+        env.bytecode_cache = _BytecodeCache()
+    except (OSError, RuntimeError):
+        logger.debug("Template bytecode cache is unavailable", exc_info=True)
+
+
 column_chunk_pages_name = ":column_chunk_pages"
 page_header_and_data_name = ":page_header_and_data"
 
@@ -25,6 +65,18 @@ column_index_group_name = ":column_indexes"
 offset_index_group_name = ":offset_indexes"
 bloom_filter_group_name = ":bloom_filters"
 
+segment_class_mapping = {
+    "magic_number": "segment--magic",
+    "footer_length": "segment--value",
+    column_chunk_pages_name: "segment--column-chunk-pages",
+    "page": "segment--page",
+    "page_data": "segment--page",
+    page_group_name: "segment--group",
+    column_index_group_name: "segment--group",
+    offset_index_group_name: "segment--group",
+    bloom_filter_group_name: "segment--group",
+}
+
 
 @dataclass
 class SchemaElement:
@@ -58,91 +110,98 @@ class SchemaElement:
 
 
 def build_schema_tree(schema_elements: list[SchemaElement]) -> list[SchemaElement]:
-    def build_tree(index: int) -> tuple[SchemaElement, int]:
-        element = schema_elements[index]
-        node = SchemaElement(
-            type=element.type,
-            type_length=element.type_length,
-            repetition_type=element.repetition_type,
-            name=element.name,
-            num_children=element.num_children,
-            converted_type=element.converted_type,
-            scale=element.scale,
-            precision=element.precision,
-            field_id=element.field_id,
-            logical_type=element.logical_type,
-            children=[],
-        )
-        index += 1
-        if element.num_children:
-            for _ in range(element.num_children):
-                child, index = build_tree(index)
-                node.children.append(child)
-        return node, index
-
     tree = []
-    index = 0
-    while index < len(schema_elements):
-        node, index = build_tree(index)
-        tree.append(node)
+    # Open group nodes with the number of children still to be attached
+    stack: list[tuple[SchemaElement, int]] = []
+    # The elements themselves become the tree nodes; only their children are reset
+    for node in schema_elements:
+        node.children = []
+        if stack:
+            parent, remaining = stack[-1]
+            parent.children.append(node)
+            stack[-1] = (parent, remaining - 1)
+        else:
+            tree.append(node)
+        if node.num_children:
+            stack.append((node, node.num_children))
+        while stack and stack[-1][1] == 0:
+            stack.pop()
     return tree
 
 
-def build_logical_type_mapping(
-    schema_tree: list[SchemaElement],
-) -> dict[tuple[str, ...], dict]:
+def build_logical_type_mapping(schema: list[dict]) -> dict[tuple[str, ...], dict]:
     mapping = {}
-
-    def traverse(node: SchemaElement, path: tuple[str, ...]):
-        current_path = path + (node.name,)
-        if node.logical_type:
-            mapping[current_path] = node.logical_type
-        for child in node.children:
-            traverse(child, current_path)
-
-    for root in schema_tree:
-        traverse(root, ())
-
-    # Drop the first element which is the root schema
-    return {k[1:]: v for k, v in mapping.items()}
+    # Paths of open group elements with the number of children still to come
+    stack: list[tuple[tuple[str, ...], int]] = []
+    for element in schema:
+        logical_type = element.get("logicalType")
+        num_children = element.get("num_children")
+        if stack:
+            parent_path, remaining = stack[-1]
+            stack[-1] = (parent_path, remaining - 1)
+            path = parent_path + (element["name"],)
+        else:
+            # The root schema element is not part of column paths
+            path = ()
+        if logical_type:
+            mapping[path] = logical_type
+        if num_children:
+            stack.append((path, num_children))
+        while stack and stack[-1][1] == 0:
+            stack.pop()
+    return mapping
 
 
 def get_codecs(footer: dict) -> list[str]:
-    codecs = []
-    for row_group in footer.get("row_groups", []):
-        for column_chunk in row_group.get("columns", []):
-            codec = column_chunk.get("meta_data", {}).get("codec")
-            if codec and codec not in codecs:
-                codecs.append(codec)
-    return codecs
+    codecs = (
+        column_chunk.get("meta_data", {}).get("codec")
+        for row_group in footer.get("row_groups", [])
+        for column_chunk in row_group.get("columns", [])
+    )
+    return [codec for codec in dict.fromkeys(codecs) if codec]
 
 
 def get_encodings(footer: dict) -> list[str]:
-    encodings = []
-    for row_group in footer.get("row_groups", []):
-        for column_chunk in row_group.get("columns", []):
-            for page in column_chunk.get("meta_data", {}).get("encodings", []):
-                if page and page not in encodings:
-                    encodings.append(page)
-    return sorted(encodings)
+    return sorted(
+        {
+            encoding
+            for row_group in footer.get("row_groups", [])
+            for column_chunk in row_group.get("columns", [])
+            for encoding in column_chunk.get("meta_data", {}).get("encodings", ())
+            if encoding
+        }
+    )
+
+
+def _reduce_min_max(stats_aggr: dict, min_value: Any, max_value: Any) -> None:
+    if min_value is not None:
+        current_min = stats_aggr.get("min_value")
+        if current_min is None or min_value < current_min:
+            stats_aggr["min_value"] = min_value
+    if max_value is not None:
+        current_max = stats_aggr.get("max_value")
+        if current_max is None or max_value > current_max:
+            stats_aggr["max_value"] = max_value
 
 
 def aggregate_column_chunks(
     footer: dict, logical_type_mapping: dict[tuple[str, ...], dict]
 ) -> list[dict]:
-    columns = {}
+    columns: dict[tuple[str, ...], dict[str, Any]] = {}
     for row_group in footer.get("row_groups", []):
         for column_chunk in row_group.get("columns", []):
-            if "path_in_schema" not in column_chunk.get("meta_data", {}):
+            meta = column_chunk.get("meta_data")
+            if not meta or "path_in_schema" not in meta:
                 continue
-            path_in_schema = tuple(column_chunk["meta_data"]["path_in_schema"])
-            data_type = column_chunk.get("meta_data", {}).get("type")
-            logical_type = logical_type_mapping.get(path_in_schema)
-            if path_in_schema not in columns:
-                columns[path_in_schema] = {
+            path_in_schema = tuple(meta["path_in_schema"])
+            data_type = meta.get("type")
+            col = columns.get(path_in_schema)
+            if col is None:
+                col = columns[path_in_schema] = {
                     "path_in_schema": path_in_schema,
                     "type": data_type,
-                    "type_length": column_chunk.get("meta_data", {}).get("type_length"),
+                    "type_length": meta.get("type_length"),
+                    "logical_type": logical_type_mapping.get(path_in_schema),
                     "num_values": 0,
                     "total_uncompressed_size": 0,
                     "total_compressed_size": 0,
@@ -150,43 +209,29 @@ def aggregate_column_chunks(
                     "encoding_stats": {},
                     "codecs": set(),
                 }
-            columns[path_in_schema]["num_values"] += column_chunk.get(
-                "meta_data", {}
-            ).get("num_values", 0)
-            columns[path_in_schema]["total_uncompressed_size"] += column_chunk.get(
-                "meta_data", {}
-            ).get("total_uncompressed_size", 0)
-            columns[path_in_schema]["total_compressed_size"] += column_chunk.get(
-                "meta_data", {}
-            ).get("total_compressed_size", 0)
-            columns[path_in_schema]["encodings"].update(
-                column_chunk.get("meta_data", {}).get("encodings", [])
-            )
-            if column_chunk.get("meta_data", {}).get("statistics"):
-                stats = column_chunk["meta_data"]["statistics"]
-                stats_aggr = columns[path_in_schema].setdefault("statistics", {})
+            col["num_values"] += meta.get("num_values", 0)
+            col["total_uncompressed_size"] += meta.get("total_uncompressed_size", 0)
+            col["total_compressed_size"] += meta.get("total_compressed_size", 0)
+            col["encodings"].update(meta.get("encodings", ()))
+            stats = meta.get("statistics")
+            if stats:
+                stats_aggr = col.setdefault("statistics", {})
                 if "null_count" in stats:
                     stats_aggr["null_count"] = (
                         stats_aggr.get("null_count", 0) + stats["null_count"]
                     )
-                if "min_value" in stats and data_type is not None:
-                    decoded_value = decode_stats_value(
-                        stats["min_value"], data_type, logical_type
-                    )
-                    if "min_value" not in stats_aggr:
-                        stats_aggr["min_value"] = decoded_value
-                    else:
-                        if decoded_value < stats_aggr["min_value"]:
-                            stats_aggr["min_value"] = decoded_value
-                if "max_value" in stats and data_type is not None:
-                    decoded_value = decode_stats_value(
-                        stats["max_value"], data_type, logical_type
-                    )
-                    if "max_value" not in stats_aggr:
-                        stats_aggr["max_value"] = decoded_value
-                    else:
-                        if decoded_value > stats_aggr["max_value"]:
-                            stats_aggr["max_value"] = decoded_value
+                if data_type is not None:
+                    logical_type = col["logical_type"]
+                    decoded_min = decoded_max = None
+                    if "min_value" in stats:
+                        decoded_min = decode_stats_value(
+                            stats["min_value"], data_type, logical_type
+                        )
+                    if "max_value" in stats:
+                        decoded_max = decode_stats_value(
+                            stats["max_value"], data_type, logical_type
+                        )
+                    _reduce_min_max(stats_aggr, decoded_min, decoded_max)
                 if "is_min_value_exact" in stats:
                     stats_aggr["is_min_value_exact"] = (
                         stats_aggr.get("is_min_value_exact", True)
@@ -197,24 +242,22 @@ def aggregate_column_chunks(
                         stats_aggr.get("is_max_value_exact", True)
                         and stats["is_max_value_exact"]
                     )
-            if column_chunk.get("meta_data", {}).get("encoding_stats"):
-                for item in column_chunk.get("meta_data", {})["encoding_stats"]:
+            encoding_stats = meta.get("encoding_stats")
+            if encoding_stats:
+                col_encoding_stats = col["encoding_stats"]
+                for item in encoding_stats:
                     key = (item["page_type"], item["encoding"])
-                    if key not in columns[path_in_schema]["encoding_stats"]:
-                        columns[path_in_schema]["encoding_stats"][key] = {
+                    if key not in col_encoding_stats:
+                        col_encoding_stats[key] = {
                             "page_type": item["page_type"],
                             "encoding": item["encoding"],
                             "count": 0,
                         }
-                    columns[path_in_schema]["encoding_stats"][key]["count"] += item[
-                        "count"
-                    ]
-            columns[path_in_schema]["codecs"].add(
-                column_chunk.get("meta_data", {}).get("codec")
-            )
-    for path_in_schema, col in columns.items():
+                    col_encoding_stats[key]["count"] += item["count"]
+            col["codecs"].add(meta.get("codec"))
+    for col in columns.values():
         if "statistics" in col:
-            logical_type = logical_type_mapping.get(path_in_schema)
+            logical_type = col["logical_type"]
             if "min_value" in col["statistics"]:
                 col["statistics"]["min_value"] = encode_stats_value(
                     col["statistics"]["min_value"],
@@ -270,41 +313,45 @@ def get_page_mapping(segments: list[dict]) -> dict[int, dict]:
     return mapping
 
 
-def get_num_values(page: dict) -> int | None:
-    for item in page.get("value", []):
-        if item.get("name") == "data_page_header":
-            for item2 in item.get("value", []):
-                if item2.get("name") == "num_values":
-                    return item2.get("value")
-        elif item.get("name") == "data_page_header_v2":
-            for item2 in item.get("value", []):
-                if item2.get("name") == "num_values":
-                    return item2.get("value")
-        elif item.get("name") == "dictionary_page_header":
-            for item2 in item.get("value", []):
-                if item2.get("name") == "num_values":
-                    return item2.get("value")
-    offset = page.get("offset")
-    if offset is None:
-        logger.warning("Could not find num_values in page with unknown offset")
-    else:
-        logger.warning("Could not find num_values in page at offset %d", offset)
+def index_fields(segment: dict) -> dict[str, dict]:
+    fields: dict[str, dict] = {}
+    for field in segment.get("value") or ():
+        if isinstance(field, dict) and "name" in field:
+            fields.setdefault(field["name"], field)
+    return fields
+
+
+def find_num_values(fields: dict[str, dict]) -> int | None:
+    for header_name in (
+        "data_page_header",
+        "data_page_header_v2",
+        "dictionary_page_header",
+    ):
+        header = fields.get(header_name)
+        if header is not None:
+            num_values = index_fields(header).get("num_values")
+            if num_values is not None:
+                return num_values.get("value")
     return None
 
 
-def get_next_page_offset(current_offset: int, page: dict) -> int | None:
+def get_next_page_offset(
+    current_offset: int, page: dict, fields: dict[str, dict] | None = None
+) -> int | None:
     if "length" not in page or "value" not in page:
         return None
     length = page["length"]
     if not isinstance(length, int):
         return None
-    for item in page["value"]:
-        if item["name"] == "compressed_page_size":
-            compressed_page_size = item["value"]
-            if not isinstance(compressed_page_size, int):
-                return None
-            return current_offset + length + compressed_page_size
-    return None
+    if fields is None:
+        fields = index_fields(page)
+    compressed_page_size_field = fields.get("compressed_page_size")
+    if compressed_page_size_field is None:
+        return None
+    compressed_page_size = compressed_page_size_field["value"]
+    if not isinstance(compressed_page_size, int):
+        return None
+    return current_offset + length + compressed_page_size
 
 
 # Fix DuckDB data_page_offset if dictionary_page_offset exists
@@ -323,13 +370,12 @@ def fix_duckdb_data_page_offset(
     if not isinstance(dict_page_header_length, int):
         return data_page_offset
     dict_page_size = 0
-    for field in dict_page.get("value", []):
-        if isinstance(field, dict) and field.get("name") == "compressed_page_size":
-            compressed_page_size = field.get("value")
-            if not isinstance(compressed_page_size, int):
-                return data_page_offset
-            dict_page_size = compressed_page_size
-            break
+    compressed_page_size_field = index_fields(dict_page).get("compressed_page_size")
+    if compressed_page_size_field is not None:
+        compressed_page_size = compressed_page_size_field.get("value")
+        if not isinstance(compressed_page_size, int):
+            return data_page_offset
+        dict_page_size = compressed_page_size
     if dict_page_size == 0:
         return data_page_offset
     expected_data_page_offset = (
@@ -348,6 +394,21 @@ def fix_duckdb_data_page_offset(
 def build_page_offset_to_column_chunk_mapping(
     footer: dict, page_mapping: dict[int, dict]
 ) -> dict[int, Tuple[int, int]]:
+    # Flatten the page headers into plain ints once so that following the
+    # pages of a column chunk below is only integer arithmetic
+    page_num_values: dict[int, int | None] = {}
+    next_page_offsets: dict[int, int | None] = {}
+    for offset, page in page_mapping.items():
+        fields = index_fields(page)
+        page_num_values[offset] = find_num_values(fields)
+        next_page_offsets[offset] = get_next_page_offset(offset, page, fields)
+
+    def num_values_at(offset: int) -> int | None:
+        num_values = page_num_values[offset]
+        if num_values is None:
+            logger.warning("Could not find num_values in page at offset %d", offset)
+        return num_values
+
     page_offsets = {}
     for row_group_index, row_group in enumerate(footer.get("row_groups", [])):
         for column_index, column_chunk in enumerate(row_group.get("columns", [])):
@@ -368,19 +429,17 @@ def build_page_offset_to_column_chunk_mapping(
                 remaining_values = column_chunk.get("meta_data", {}).get(
                     "num_values", 0
                 )
-                page = page_mapping.get(data_page_offset)
-                if page is not None:
-                    num_values = get_num_values(page)
+                if data_page_offset in page_num_values:
+                    num_values = num_values_at(data_page_offset)
                     if num_values is not None and num_values < remaining_values:
                         remaining_values -= num_values
-                        next_page_offset = get_next_page_offset(data_page_offset, page)
+                        next_page_offset = next_page_offsets[data_page_offset]
                         while (
                             next_page_offset is not None
                             and remaining_values > 0
-                            and next_page_offset in page_mapping
+                            and next_page_offset in page_num_values
                         ):
-                            next_page = page_mapping[next_page_offset]
-                            next_num_values = get_num_values(next_page)
+                            next_num_values = num_values_at(next_page_offset)
                             if next_num_values is None:
                                 break
                             page_offsets[next_page_offset] = (
@@ -388,9 +447,7 @@ def build_page_offset_to_column_chunk_mapping(
                                 column_index,
                             )
                             remaining_values -= next_num_values
-                            next_page_offset = get_next_page_offset(
-                                next_page_offset, next_page
-                            )
+                            next_page_offset = next_page_offsets[next_page_offset]
                         if remaining_values > 0:
                             logger.warning(
                                 "Could not map all pages for column chunk at row group %d, column %d",
@@ -426,119 +483,104 @@ def sanitize_segment(segment: dict, max_length: int):
 
 
 def group_segments(segments: list[dict], footer: dict) -> list[dict]:
-    grouped_segments = group_segments_by_page(segments)
     page_mapping = get_page_mapping(segments)
     page_offset_to_column_chunk = build_page_offset_to_column_chunk_mapping(
         footer, page_mapping
     )
-    final_grouped = []
-    current_row_group_index = None
-    current_column_index = None
-    current_group: list[dict] = []
-    num_total_pages = 0
-
-    def close_current_group():
-        nonlocal \
-            current_row_group_index, \
-            current_column_index, \
-            current_group, \
-            num_total_pages
-        if current_group:
-            final_grouped.append(
-                {
-                    "name": column_chunk_pages_name,
-                    "value": [item for seg in current_group for item in seg["value"]],
-                    "offset": current_group[0]["offset"],
-                    "length": sum(seg["length"] for seg in current_group),
-                    "row_group_index": current_row_group_index,
-                    "column_index": current_column_index,
-                    "num_pages": len(current_group),
-                }
-            )
-            current_row_group_index = None
-            current_column_index = None
-            num_total_pages += len(current_group)
-            current_group = []
-
-    for group in grouped_segments:
-        if group["name"] == page_header_and_data_name:
-            page_offset = group["value"][0]["offset"]
-            column_chunk_info = page_offset_to_column_chunk.get(page_offset)
-            if column_chunk_info:
-                row_group_index, column_index = column_chunk_info
-                if (
-                    current_row_group_index is None
-                    or current_row_group_index == row_group_index
-                    and current_column_index == column_index
-                ):
-                    current_row_group_index = row_group_index
-                    current_column_index = column_index
-                    current_group.append(group)
-                    continue
-                else:
-                    close_current_group()
-                    current_row_group_index = row_group_index
-                    current_column_index = column_index
-                    current_group = [group]
-                    continue
-            else:
-                logger.warning(
-                    "Page at offset %d not mapped to any column chunk", page_offset
-                )
-                close_current_group()
-                final_grouped.append(group)
-                num_total_pages += 1
+    run_group_names = {
+        column_chunk_pages_name: page_group_name,
+        "column_index": column_index_group_name,
+        "offset_index": offset_index_group_name,
+        "bloom_filter": bloom_filter_group_name,
+    }
+
+    # Pages are paired with their page_data by group_segments_by_page, then
+    # grouped in a single pass: the pages of a column chunk are collected into
+    # one group, and consecutive column chunk groups and index/bloom filter
+    # segments are collected into runs.
+    grouped: list[dict] = []
+    run: dict | None = None
+    run_item_name: str | None = None
+    column_chunk: dict | None = None
+    column_chunk_key: tuple[int, int] | None = None
+
+    def emit(item: dict):
+        nonlocal run, run_item_name
+        name = item["name"]
+        if run is not None and name == run_item_name:
+            run["value"].append(item)
+            run["length"] += item["length"]
+            return
+        group_name = run_group_names.get(name)
+        if group_name is None:
+            run = None
+            run_item_name = None
+            grouped.append(item)
         else:
-            close_current_group()
-            final_grouped.append(group)
-
-    def make_groups(items: list[dict], group_names: dict[str, str]) -> list[dict]:
-        result = []
-        index = 0
-        while index < len(items):
-            item = items[index]
-            if item["name"] in group_names:
-                group_name = group_names[item["name"]]
-                group_items = []
-                while index < len(items) and items[index]["name"] == item["name"]:
-                    group_items.append(items[index])
-                    index += 1
-                result.append(
-                    {
-                        "name": group_name,
-                        "value": group_items,
-                        "offset": group_items[0]["offset"],
-                        "length": sum(seg["length"] for seg in group_items),
-                    }
-                )
-            else:
-                result.append(item)
-                index += 1
-        return result
+            run = {
+                "name": group_name,
+                "value": [item],
+                "offset": item["offset"],
+                "length": item["length"],
+            }
+            run_item_name = name
+            grouped.append(run)
+
+    def close_column_chunk():
+        nonlocal column_chunk, column_chunk_key
+        if column_chunk is not None:
+            emit(column_chunk)
+            column_chunk = None
+            column_chunk_key = None
+
+    for item in group_segments_by_page(segments):
+        if item["name"] != page_header_and_data_name:
+            close_column_chunk()
+            emit(item)
+            continue
+        key = page_offset_to_column_chunk.get(item["offset"])
+        if key is None:
+            logger.warning(
+                "Page at offset %d not mapped to any column chunk", item["offset"]
+            )
+            close_column_chunk()
+            emit(item)
+            continue
+        if column_chunk is not None and key != column_chunk_key:
+            close_column_chunk()
+        if column_chunk is None:
+            column_chunk = {
+                "name": column_chunk_pages_name,
+                "value": [],
+                "offset": item["offset"],
+                "length": 0,
+                "row_group_index": key[0],
+                "column_index": key[1],
+                "num_pages": 0,
+            }
+            column_chunk_key = key
+        column_chunk["value"] += item["value"]
+        column_chunk["length"] += item["length"]
+        column_chunk["num_pages"] += 1
+    close_column_chunk()
+    return grouped
 
-    return make_groups(
-        final_grouped,
-        {
-            column_chunk_pages_name: ":pages",
-            "column_index": ":column_indexes",
-            "offset_index": ":offset_indexes",
-            "bloom_filter": ":bloom_filters",
-        },
-    )
+
+_power_labels = ("bytes", "KB", "MB", "GB", "TB")
 
 
+@lru_cache(maxsize=4096)
 def format_bytes(size):
     # 2**10 = 1024
     power = 2**10
     n = 0
-    power_labels = {0: "bytes", 1: "KB", 2: "MB", 3: "GB", 4: "TB"}
     while size >= power and n < 4:
         size /= power
         n += 1
     if n == 0:
-        return f"{int(size)} {power_labels[n]}"
+        return f"{int(size)} {_power_labels[n]}"
     else:
-        return f"{size:.2f} {power_labels[n]}"
+        return f"{size:.2f} {_power_labels[n]}"
 
 
 def format_logical_type(logical_type: dict[str, Any]) -> str:
@@ -588,64 +630,115 @@ def format_logical_type(logical_type: dict[str, Any]) -> str:
     return str(logical_type)
 
 
+_pack_int32 = struct.Struct("<i").pack
+_pack_int64 = struct.Struct("<q").pack
+_pack_float = struct.Struct("<f").pack
+_pack_double = struct.Struct("<d").pack
+_pack_bool = struct.Struct("<?").pack
+_unpack_int32 = struct.Struct("<i").unpack
+_unpack_int64 = struct.Struct("<q").unpack
+_unpack_float = struct.Struct("<f").unpack
+_unpack_double = struct.Struct("<d").unpack
+
+
+def _decode_int_le(binary_value) -> int:
+    return int.from_bytes(binary_value, byteorder="little", signed=True)
+
+
+def _decode_int32(binary_value) -> int:
+    if len(binary_value) == 4:
+        return _unpack_int32(binary_value)[0]
+    return _decode_int_le(binary_value)
+
+
+def _decode_int64(binary_value) -> int:
+    if len(binary_value) == 8:
+        return _unpack_int64(binary_value)[0]
+    return _decode_int_le(binary_value)
+
+
+def _decode_int_be(binary_value) -> int:
+    return int.from_bytes(binary_value, byteorder="big", signed=True)
+
+
+def _decode_float(binary_value) -> float:
+    return _unpack_float(binary_value)[0]
+
+
+def _decode_double(binary_value) -> float:
+    return _unpack_double(binary_value)[0]
+
+
+def _decode_bool(binary_value) -> bool:
+    return bool(int.from_bytes(binary_value, byteorder="little"))
+
+
+def _encode_int_be(value: int) -> bytes:
+    bitlen = value.bit_length() or 1
+    length = (bitlen + 8) // 8
+    return value.to_bytes(length, byteorder="big", signed=True)
+
+
+# Physical type -> decoder/encoder of the statistics value
+_stats_value_decoders = {
+    "INT32": _decode_int32,
+    "INT64": _decode_int64,
+    "FLOAT": _decode_float,
+    "DOUBLE": _decode_double,
+    "BOOLEAN": _decode_bool,
+}
+_stats_value_encoders = {
+    "INT32": _pack_int32,
+    "INT64": _pack_int64,
+    "FLOAT": _pack_float,
+    "DOUBLE": _pack_double,
+    "BOOLEAN": _pack_bool,
+}
+
+# Physical type -> decoder/encoder of the unscaled integer of a DECIMAL value
+_decimal_stats_value_decoders = {
+    "FIXED_LEN_BYTE_ARRAY": _decode_int_be,
+    "INT32": _decode_int32,
+    "INT64": _decode_int64,
+}
+_decimal_stats_value_encoders = {
+    "FIXED_LEN_BYTE_ARRAY": _encode_int_be,
+    "INT32": _pack_int32,
+    "INT64": _pack_int64,
+}
+
+
 def decode_stats_value(binary_value, type_str: str, logical_type: dict | None) -> Any:
     if logical_type is not None and "DECIMAL" in logical_type:
-        scale = logical_type["DECIMAL"].get("scale", 0)
-        if type_str == "FIXED_LEN_BYTE_ARRAY":
-            int_value = int.from_bytes(binary_value, byteorder="big", signed=True)
-            return Decimal(int_value).scaleb(-scale)
-        if type_str == "INT32" or type_str == "INT64":
-            int_value = int.from_bytes(binary_value, byteorder="little", signed=True)
-            return Decimal(int_value).scaleb(-scale)
-    if type_str == "INT32" or type_str == "INT64":
-        int_value = int.from_bytes(binary_value, byteorder="little", signed=True)
-        return int_value
-    if type_str == "FLOAT":
-        float_value = struct.unpack("<f", binary_value)[0]
-        return float_value
-    if type_str == "DOUBLE":
-        double_value = struct.unpack("<d", binary_value)[0]
-        return double_value
-    if type_str == "BOOLEAN":
-        bool_value = bool(int.from_bytes(binary_value, byteorder="little"))
-        return bool_value
-    return binary_value
+        decode_unscaled = _decimal_stats_value_decoders.get(type_str)
+        if decode_unscaled is not None:
+            scale = logical_type["DECIMAL"].get("scale", 0)
+            return Decimal(decode_unscaled(binary_value)).scaleb(-scale)
+    decode = _stats_value_decoders.get(type_str)
+    if decode is None:
+        return binary_value
+    return decode(binary_value)
 
 
 def encode_stats_value(
     value: Any, type_str: str, type_length: int, logical_type: dict | None
 ) -> bytes:
     if logical_type is not None and "DECIMAL" in logical_type:
-        scale = logical_type["DECIMAL"].get("scale", 0)
-        if type_str == "FIXED_LEN_BYTE_ARRAY":
-            scaled = int(value.scaleb(scale))
-            bitlen = scaled.bit_length() or 1
-            length = (bitlen + 8) // 8
-            return scaled.to_bytes(length, byteorder="big", signed=True)
-        if type_str == "INT32":
-            scaled = int(value.scaleb(scale))
-            return struct.pack("<i", scaled)
-        if type_str == "INT64":
-            scaled = int(value.scaleb(scale))
-            return struct.pack("<q", scaled)
-    if type_str == "INT32":
-        return struct.pack("<i", value)
-    if type_str == "INT64":
-        return struct.pack("<q", value)
-    if type_str == "FLOAT":
-        return struct.pack("<f", value)
-    if type_str == "DOUBLE":
-        return struct.pack("<d", value)
-    if type_str == "BOOLEAN":
-        return struct.pack("<?", value)
-    return value
+        encode_unscaled = _decimal_stats_value_encoders.get(type_str)
+        if encode_unscaled is not None:
+            scale = logical_type["DECIMAL"].get("scale", 0)
+            return encode_unscaled(int(value.scaleb(scale)))
+    encode = _stats_value_encoders.get(type_str)
+    if encode is None:
+        return value
+    return encode(value)
 
 
 def format_stats_value(binary_value, type_str: str, logical_type: dict | None) -> str:
     decoded_value = decode_stats_value(binary_value, type_str, logical_type)
     if isinstance(decoded_value, bytes):
         max_length = 256
-        if "STRING" in (logical_type or {}):
+        if logical_type is not None and "STRING" in logical_type:
             s = decoded_value.decode("utf-8", errors="replace")
             if len(s) <= max_length:
                 return s
@@ -657,12 +750,16 @@ def format_stats_value(binary_value, type_str: str, logical_type: dict | None) -
                 return f"0x{decoded_value.hex()}"
             else:
                 r = len(decoded_value) - max_length
-                return f"0x{decoded_value[:max_length].hex()}… ({r} more bytes)"
+                head = memoryview(decoded_value)[:max_length].hex()
+                return f"0x{head}… ({r} more bytes)"
     return str(decoded_value)
 
 
+_nice_json_encoder = json.JSONEncoder(indent=2, default=str)
+
+
 def to_nice_json(value):
-    return json.dumps(value, indent=2, default=lambda x: str(x))
+    return _nice_json_encoder.encode(value)
 
 
 def is_nested_segment(segment: Any) -> bool:
@@ -679,6 +776,24 @@ def is_nested_segment(segment: Any) -> bool:
     return False
 
 
+def assign_segment_css_classes(segments: list[dict]) -> list[dict]:
+    # Resolve the CSS class of every segment once here instead of looking it
+    # up (twice) per segment in the template
+    stack = list(segments)
+    while stack:
+        segment = stack.pop()
+        nested = is_nested_segment(segment)
+        css_class = segment_class_mapping.get(segment["name"])
+        if css_class is None:
+            css_class = "" if nested else "segment--value"
+        segment["css_class"] = css_class
+        if nested:
+            stack.extend(
+                item for item in segment.get("value", []) if isinstance(item, dict)
+            )
+    return segments
+
+
 env.globals["format_bytes"] = format_bytes
 env.globals["format_logical_type"] = format_logical_type
 env.globals["format_stats_value"] = format_stats_value
@@ -694,33 +809,35 @@ def generate_html_report(
     segments,
     sections=[],
 ) -> str:
+    _attach_bytecode_cache()
     template = env.get_template("report.html")
-    codecs = get_codecs(footer)
-    encodings = get_encodings(footer)
-    schema_tree = build_schema_tree(
-        [SchemaElement.from_json(elem) for elem in footer["schema"]]
-    )
-    logical_type_mapping = build_logical_type_mapping(schema_tree)
-    columns = aggregate_column_chunks(footer, logical_type_mapping)
+    # Only prepare the data used by the sections being rendered
+    if "summary" in sections:
+        codecs = get_codecs(footer)
+        encodings = get_encodings(footer)
+    else:
+        codecs = None
+        encodings = None
+    if "schema" in sections:
+        schema_tree = build_schema_tree(
+            [SchemaElement.from_json(elem) for elem in footer["schema"]]
+        )
+    else:
+        schema_tree = None
+    logical_type_mapping = None
+    columns = None
+    if "row-groups" in sections or "columns" in sections:
+        logical_type_mapping = build_logical_type_mapping(footer["schema"])
+        if "columns" in sections:
+            columns = aggregate_column_chunks(footer, logical_type_mapping)
     if "segments" in sections:
         segments = sanitize_segments(segments)
         grouped_segments = group_segments(segments, footer)
-        segment_class_mapping = {
-            "magic_number": "segment--magic",
-            "footer_length": "segment--value",
-            column_chunk_pages_name: "segment--column-chunk-pages",
-            "page": "segment--page",
-            "page_data": "segment--page",
-            page_group_name: "segment--group",
-            column_index_group_name: "segment--group",
-            offset_index_group_name: "segment--group",
-            bloom_filter_group_name: "segment--group",
-        }
+        assign_segment_css_classes(grouped_segments)
     else:
         grouped_segments = None
-        segment_class_mapping = None
     html = template.render(
-        filename=pathlib.Path(file_path).name,
+        filename=os.path.basename(file_path),
         file_path=file_path,
         summary=summary,
         footer=footer,
@@ -730,7 +847,6 @@ def generate_html_report(
         columns=columns,
         logical_type_mapping=logical_type_mapping,
         grouped_segments=grouped_segments,
-        segment_class_mapping=segment_class_mapping,
         sections=sections,
     )
     return html
@@ -1,10 +1,18 @@
 from __future__ import annotations
 
 import argparse
+import codecs
+import contextlib
 import json
 import logging
-import pathlib
-from typing import Sequence
+import os
+import sys
+from typing import Any, Sequence, TextIO
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised when orjson is not installed
+    orjson = None  # type: ignore[assignment]
 
 from ._core import (
     find_footer_segment,
@@ -55,34 +63,66 @@ def build_argument_parser() -> argparse.ArgumentParser:
     return parser
 
 
+def write_json(obj: Any, out: TextIO) -> None:
+    """Write ``obj`` to ``out`` as indented JSON, using orjson for UTF-8 streams."""
+
+    # orjson always emits non-ASCII characters as raw UTF-8, while json.dump
+    # escapes them, so only use it where the stream can encode any character
+    # (in-memory text streams such as io.StringIO have no encoding)
+    encoding = getattr(out, "encoding", None)
+    if orjson is None or (
+        encoding is not None and codecs.lookup(encoding).name != "utf-8"
+    ):
+        json.dump(obj, out, indent=2, default=json_encode)
+        out.write("\n")
+        return
+    data = orjson.dumps(
+        obj,
+        default=json_encode,
+        option=orjson.OPT_INDENT_2
+        | orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_APPEND_NEWLINE,
+    )
+    # Hand the UTF-8 bytes to the underlying binary stream when possible
+    # instead of decoding them into another full-size str. Where text streams
+    # translate "\n" (os.linesep is "\r\n" on Windows) the bytes go through
+    # the text layer, so the output matches the json.dump fallback.
+    buffer = getattr(out, "buffer", None)
+    if buffer is not None and os.linesep == "\n":
+        out.flush()
+        buffer.write(data)
+    else:
+        out.write(data.decode())
+
+
 def main(argv: Sequence[str] | None = None) -> None:
     parser = build_argument_parser()
     args = parser.parse_args(argv)
 
+    level = logging.getLevelName(args.log_level.upper())
+    if not isinstance(level, int):
+        parser.error(f"unknown log level: {args.log_level}")
     logging.basicConfig(
-        level=logging.getLevelNamesMapping()[args.log_level.upper()],
+        level=level,
         format="%(asctime)s %(name)s [%(threadName)s] %(levelname)s %(message)s",
         datefmt="%Y-%m-%d %H:%M:%S",
     )
 
     segments, column_chunk_data_offsets = parse_parquet_file(args.parquet_file)
+    payload: Any
     if args.output_mode == "default":
         footer = segment_to_json(find_footer_segment(segments))
-        output = json.dumps(
-            {
-                "summary": get_summary(footer, segments),
-                "footer": footer,
-                "pages": get_pages(segments, column_chunk_data_offsets),
-            },
-            indent=2,
-            default=json_encode,
-        )
+        payload = {
+            "summary": get_summary(footer, segments),
+            "footer": footer,
+            "pages": get_pages(segments, column_chunk_data_offsets),
+        }
     elif args.output_mode == "segments":
-        output = json.dumps(segments, indent=2, default=json_encode)
+        payload = segments
     elif args.output_mode == "html":
         footer = segment_to_json(find_footer_segment(segments))
         summary = get_summary(footer, segments)
-        output = generate_html_report(
+        payload = generate_html_report(
             args.parquet_file,
             summary=summary,
             footer=footer,
@@ -92,10 +132,16 @@ def main(argv: Sequence[str] | None = None) -> None:
     else:
         raise ValueError(f"Unknown output mode: {args.output_mode}")
 
-    if args.output:
-        pathlib.Path(args.output).write_text(output)
-    else:
-        print(output)
+    with (
+        open(args.output, "w", encoding="utf-8")
+        if args.output
+        else contextlib.nullcontext(sys.stdout)
+    ) as out:
+        if isinstance(payload, str):
+            out.write(payload)
+            out.write("\n")
+        else:
+            write_json(payload, out)
 
 
 if __name__ == "__main__":  # pragma: no cover
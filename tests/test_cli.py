@@ -1,3 +1,4 @@
+import io
 import json
 
 import pytest
@@ -76,3 +77,61 @@ def test_cli_main_accepts_log_level(monkeypatch, capsys, level):
     payload = json.loads(captured.out)
 
     assert payload["summary"]["num_rows"] == 1
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_write_json_matches_stdlib_layout(monkeypatch, use_orjson):
+    if use_orjson:
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(cli, "orjson", None)
+    obj = {"name": "magic", "offset": 0, "value": b"PAR1", "nested": [1, {"a": None}]}
+    out = io.StringIO()
+
+    cli.write_json(obj, out)
+
+    assert out.getvalue() == json.dumps(obj, indent=2, default=cli.json_encode) + "\n"
+
+    non_ascii = {"größe": "héllo", "value": b"\xff"}
+    expected = json.dumps(non_ascii, indent=2, default=cli.json_encode) + "\n"
+    out = io.StringIO()
+
+    cli.write_json(non_ascii, out)
+
+    assert json.loads(out.getvalue()) == json.loads(expected)
+
+    # Streams that cannot encode every character get the escaped stdlib output
+    ascii_out = io.TextIOWrapper(io.BytesIO(), encoding="ascii")
+
+    cli.write_json(non_ascii, ascii_out)
+    ascii_out.flush()
+
+    assert ascii_out.buffer.getvalue().decode("ascii") == expected
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_write_json_translates_newlines_like_stdlib(monkeypatch, use_orjson):
+    if use_orjson:
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(cli, "orjson", None)
+    monkeypatch.setattr(cli.os, "linesep", "\r\n")
+    obj = {"name": "magic", "nested": [1, 2]}
+    out = io.TextIOWrapper(io.BytesIO(), encoding="utf-8", newline="\r\n")
+
+    cli.write_json(obj, out)
+    out.flush()
+
+    expected = json.dumps(obj, indent=2) + "\n"
+    assert out.buffer.getvalue() == expected.replace("\n", "\r\n").encode()
+
+
+def test_cli_main_writes_output_file(monkeypatch, tmp_path):
+    segments = [{"name": "magic", "offset": 0, "length": 4}]
+    output = tmp_path / "segments.json"
+
+    monkeypatch.setattr(cli, "parse_parquet_file", lambda path: (segments, {}))
+
+    cli.main(["--output-mode", "segments", "-o", str(output), "example.parquet"])
+
+    assert json.loads(output.read_text()) == segments
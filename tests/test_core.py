@@ -701,6 +701,15 @@ def test_json_encode_short_binary():
     assert encoded == {"type": "binary", "length": 3, "value": [97, 98, 99]}
 
 
+def test_json_encode_accepts_bytes_subclasses():
+    class Binary(bytes):
+        pass
+
+    encoded = json_encode(Binary(b"abc"))
+
+    assert encoded == {"type": "binary", "length": 3, "value": [97, 98, 99]}
+
+
 def test_parse_parquet_file_invalid_header(tmp_path):
     target = tmp_path / "invalid-header.parquet"
     target.write_bytes(b"BAD!" + b"\x00" * 12)
@@ -1,16 +1,31 @@
 import json
+import os
 import struct
+import subprocess
+import sys
 from decimal import Decimal
+from types import MappingProxyType
 
 import pytest
 
 from parquet_analyzer import _html
 
+_INT32_LE = struct.Struct("<i")
+
 
 def build_schema_elements(definitions):
     return [_html.SchemaElement.from_json(item) for item in definitions]
 
 
+def freeze(value):
+    # Read-only view of a nested footer so module-scoped fixtures can be shared
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
 def test_build_schema_tree_and_logical_type_mapping():
     schema_defs = [
         {"name": "root", "num_children": 2, "logicalType": {"STRING": {}}},
@@ -28,7 +43,7 @@ def test_build_schema_tree_and_logical_type_mapping():
     ]
 
     schema_tree = _html.build_schema_tree(build_schema_elements(schema_defs))
-    mapping = _html.build_logical_type_mapping(schema_tree)
+    mapping = _html.build_logical_type_mapping(schema_defs)
 
     assert len(schema_tree) == 1
     assert schema_tree[0].children[0].name == "group"
@@ -37,6 +52,20 @@ def test_build_schema_tree_and_logical_type_mapping():
     assert mapping[("decimal_field",)]["DECIMAL"]["scale"] == 2
 
 
+def test_build_schema_tree_handles_deep_nesting():
+    depth = 5000
+    schema_defs = [{"name": f"level{i}", "num_children": 1} for i in range(depth)] + [
+        {"name": "leaf", "logicalType": {"STRING": {}}}
+    ]
+
+    schema_tree = _html.build_schema_tree(build_schema_elements(schema_defs))
+    mapping = _html.build_logical_type_mapping(schema_defs)
+
+    assert len(schema_tree) == 1
+    path = tuple(f"level{i}" for i in range(1, depth)) + ("leaf",)
+    assert mapping == {path: {"STRING": {}}}
+
+
 def test_get_codecs_and_encodings():
     footer = {
         "row_groups": [
@@ -70,78 +99,83 @@ def test_get_codecs_and_encodings():
     assert encodings == ["DELTA", "PLAIN", "RLE"]
 
 
-def test_aggregate_column_chunks_aggregates_stats():
-    footer = {
-        "row_groups": [
-            {
-                "columns": [
-                    {
-                        "meta_data": {
-                            "path_in_schema": ["col1"],
-                            "type": "INT32",
-                            "num_values": 3,
-                            "total_uncompressed_size": 100,
-                            "total_compressed_size": 50,
-                            "encodings": ["PLAIN", "RLE"],
-                            "statistics": {
-                                "null_count": 1,
-                                "min_value": struct.pack("<i", 5),
-                                "max_value": struct.pack("<i", 20),
-                                "is_min_value_exact": True,
-                                "is_max_value_exact": True,
-                            },
-                            "encoding_stats": [
-                                {
-                                    "page_type": "DATA_PAGE",
-                                    "encoding": "PLAIN",
-                                    "count": 1,
-                                }
-                            ],
-                            "codec": "SNAPPY",
-                        }
-                    }
-                ]
-            },
-            {
-                "columns": [
-                    {
-                        "meta_data": {
-                            "path_in_schema": ["col1"],
-                            "type": "INT32",
-                            "num_values": 2,
-                            "total_uncompressed_size": 70,
-                            "total_compressed_size": 30,
-                            "encodings": ["RLE"],
-                            "statistics": {
-                                "null_count": 2,
-                                "min_value": struct.pack("<i", 3),
-                                "max_value": struct.pack("<i", 25),
-                                "is_min_value_exact": False,
-                                "is_max_value_exact": True,
-                            },
-                            "encoding_stats": [
-                                {
-                                    "page_type": "DATA_PAGE",
-                                    "encoding": "PLAIN",
-                                    "count": 2,
+@pytest.fixture(scope="module")
+def two_row_group_footer():
+    return freeze(
+        {
+            "row_groups": [
+                {
+                    "columns": [
+                        {
+                            "meta_data": {
+                                "path_in_schema": ["col1"],
+                                "type": "INT32",
+                                "num_values": 3,
+                                "total_uncompressed_size": 100,
+                                "total_compressed_size": 50,
+                                "encodings": ["PLAIN", "RLE"],
+                                "statistics": {
+                                    "null_count": 1,
+                                    "min_value": _INT32_LE.pack(5),
+                                    "max_value": _INT32_LE.pack(20),
+                                    "is_min_value_exact": True,
+                                    "is_max_value_exact": True,
                                 },
-                                {
-                                    "page_type": "DICTIONARY_PAGE",
-                                    "encoding": "RLE_DICTIONARY",
-                                    "count": 1,
+                                "encoding_stats": [
+                                    {
+                                        "page_type": "DATA_PAGE",
+                                        "encoding": "PLAIN",
+                                        "count": 1,
+                                    }
+                                ],
+                                "codec": "SNAPPY",
+                            }
+                        }
+                    ]
+                },
+                {
+                    "columns": [
+                        {
+                            "meta_data": {
+                                "path_in_schema": ["col1"],
+                                "type": "INT32",
+                                "num_values": 2,
+                                "total_uncompressed_size": 70,
+                                "total_compressed_size": 30,
+                                "encodings": ["RLE"],
+                                "statistics": {
+                                    "null_count": 2,
+                                    "min_value": _INT32_LE.pack(3),
+                                    "max_value": _INT32_LE.pack(25),
+                                    "is_min_value_exact": False,
+                                    "is_max_value_exact": True,
                                 },
-                            ],
-                            "codec": "GZIP",
+                                "encoding_stats": [
+                                    {
+                                        "page_type": "DATA_PAGE",
+                                        "encoding": "PLAIN",
+                                        "count": 2,
+                                    },
+                                    {
+                                        "page_type": "DICTIONARY_PAGE",
+                                        "encoding": "RLE_DICTIONARY",
+                                        "count": 1,
+                                    },
+                                ],
+                                "codec": "GZIP",
+                            }
                         }
-                    }
-                ]
-            },
-        ]
-    }
+                    ]
+                },
+            ]
+        }
+    )
 
+
+def test_aggregate_column_chunks_aggregates_stats(two_row_group_footer):
     logical_type_mapping = {("col1",): None}
 
-    columns = _html.aggregate_column_chunks(footer, logical_type_mapping)
+    columns = _html.aggregate_column_chunks(two_row_group_footer, logical_type_mapping)
 
     assert len(columns) == 1
     column = columns[0]
@@ -154,12 +188,17 @@ def test_aggregate_column_chunks_aggregates_stats():
     assert stats["null_count"] == 3
     assert stats["is_min_value_exact"] is False
     assert stats["is_max_value_exact"] is True
-    assert struct.unpack("<i", stats["min_value"])[0] == 3
-    assert struct.unpack("<i", stats["max_value"])[0] == 25
+    assert _INT32_LE.unpack(stats["min_value"])[0] == 3
+    assert _INT32_LE.unpack(stats["max_value"])[0] == 25
     assert column["encoding_stats"][("DATA_PAGE", "PLAIN")]["count"] == 3
     assert column["encoding_stats"][("DICTIONARY_PAGE", "RLE_DICTIONARY")]["count"] == 1
 
 
+def test_get_codecs_and_encodings_across_row_groups(two_row_group_footer):
+    assert _html.get_codecs(two_row_group_footer) == ["SNAPPY", "GZIP"]
+    assert _html.get_encodings(two_row_group_footer) == ["PLAIN", "RLE"]
+
+
 def test_group_segments_by_page():
     segments = [
         {"name": "page", "offset": 0, "length": 2, "value": []},
@@ -174,7 +213,7 @@ def test_group_segments_by_page():
     assert grouped[1]["name"] == "other"
 
 
-def test_get_num_values_supports_headers():
+def test_find_num_values_supports_headers():
     page_v1 = {
         "value": [
             {
@@ -192,9 +231,19 @@ def test_get_num_values_supports_headers():
         ]
     }
 
-    assert _html.get_num_values(page_v1) == 7
-    assert _html.get_num_values(page_v2) == 9
-    assert _html.get_num_values({"value": []}) is None
+    assert _html.find_num_values(_html.index_fields(page_v1)) == 7
+    assert _html.find_num_values(_html.index_fields(page_v2)) == 9
+    assert _html.find_num_values(_html.index_fields({"value": []})) is None
+
+
+def test_index_fields_keeps_first_field_by_name():
+    first = {"name": "compressed_page_size", "value": 5}
+    segment = {
+        "value": [first, {"name": "compressed_page_size", "value": 6}, "raw"],
+    }
+
+    assert _html.index_fields(segment) == {"compressed_page_size": first}
+    assert _html.index_fields({"value": None}) == {}
 
 
 def test_build_page_offset_to_column_chunk_mapping():
@@ -317,6 +366,59 @@ def test_group_segments_combines_related_segments():
     assert pages_segment["value"][0]["column_index"] == 0
 
 
+def test_group_segments_keeps_trailing_column_chunk():
+    segments = [
+        {
+            "name": "page",
+            "offset": 0,
+            "length": 4,
+            "value": [
+                {"name": "compressed_page_size", "value": 2},
+                {
+                    "name": "data_page_header",
+                    "value": [{"name": "num_values", "value": 1}],
+                },
+            ],
+        },
+        {"name": "page_data", "offset": 4, "length": 2, "value": None},
+    ]
+    footer = {
+        "row_groups": [
+            {
+                "columns": [
+                    {
+                        "meta_data": {
+                            "path_in_schema": ["col1"],
+                            "data_page_offset": 0,
+                            "num_values": 1,
+                        }
+                    }
+                ]
+            }
+        ]
+    }
+
+    grouped = _html.group_segments(segments, footer)
+
+    assert [segment["name"] for segment in grouped] == [_html.page_group_name]
+    assert grouped[0]["length"] == 6
+    assert grouped[0]["value"][0]["num_pages"] == 1
+
+
+def test_assign_segment_css_classes():
+    leaf = {"name": "num_rows", "value": 3}
+    page = {"name": "page", "value": [], "metadata": {"type_class": "PageHeader"}}
+    group = {"name": _html.page_group_name, "value": [page, leaf]}
+    magic = {"name": "magic_number", "value": b"PAR1"}
+
+    _html.assign_segment_css_classes([magic, group])
+
+    assert magic["css_class"] == "segment--magic"
+    assert group["css_class"] == "segment--group"
+    assert page["css_class"] == "segment--page"
+    assert leaf["css_class"] == "segment--value"
+
+
 def test_format_helpers():
     assert _html.format_bytes(512) == "512 bytes"
     assert _html.format_bytes(2048) == "2.00 KB"
@@ -357,6 +459,11 @@ def test_to_nice_json_and_is_nested_segment():
     pretty = _html.to_nice_json(payload)
     assert json.loads(pretty) == payload
 
+    # Escaping is left to the template's autoescaping
+    raw = _html.to_nice_json({"tag": "</textarea>&"})
+    assert "</textarea>&" in raw
+    assert not hasattr(raw, "__html__")
+
     segment_plain = {"name": "value", "value": 1}
     segment_group = {"name": ":group", "value": []}
     segment_type_class = {"name": "field", "metadata": {"type_class": object}}
@@ -370,3 +477,53 @@ def test_to_nice_json_and_is_nested_segment():
     assert _html.is_nested_segment(segment_group) is True
     assert _html.is_nested_segment(segment_type_class) is True
     assert _html.is_nested_segment(segment_list) is True
+
+
+def test_raw_footer_json_is_escaped_in_report():
+    html = _html.generate_html_report(
+        "x.parquet",
+        summary={},
+        footer={"key": "</textarea>&"},
+        segments=[],
+        sections=["raw-footer"],
+    )
+
+    assert "&lt;/textarea&gt;&amp;" in html
+    assert html.count("</textarea>") == 1
+
+
+def test_bytecode_cache_ignores_unwritable_directory(tmp_path):
+    # cache_size=0 so the template is loaded (and its bytecode dumped) here
+    environment = _html.env.overlay(
+        bytecode_cache=_html._BytecodeCache(str(tmp_path / "missing")),
+        cache_size=0,
+    )
+
+    template = environment.get_template("report.html")
+
+    assert template.render(sections=[], filename="x.parquet", summary={}, footer={})
+
+
+def test_bytecode_cache_directory_is_created_on_first_render(tmp_path):
+    script = """
+import json, os, sys
+from parquet_analyzer import _html, cli
+before = os.listdir(sys.argv[1])
+attached_at_import = _html.env.bytecode_cache is not None
+_html.generate_html_report("x.parquet", summary={}, footer={}, segments=[])
+directory = _html.env.bytecode_cache.directory
+print(json.dumps([before, attached_at_import, directory, os.listdir(directory)]))
+"""
+    result = subprocess.run(
+        [sys.executable, "-c", script, str(tmp_path)],
+        env={**os.environ, "TMPDIR": str(tmp_path)},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    before, attached_at_import, directory, cached = json.loads(result.stdout)
+    assert before == []
+    assert attached_at_import is False
+    assert os.path.commonpath([directory, str(tmp_path)]) == str(tmp_path)
+    assert cached
@@ -14,10 +14,18 @@ from parquet_analyzer._core import (
 )
 
 
-@pytest.fixture()
-def sample_parquet(tmp_path):
+@pytest.fixture(scope="session")
+def _pa():
     pa = pytest.importorskip("pyarrow")
     pq = pytest.importorskip("pyarrow.parquet")
+    return pa, pq
+
+
+# The sample files are only read by the tests, so each one is written once
+# per session and shared
+@pytest.fixture(scope="session")
+def sample_parquet(_pa, tmp_path_factory):
+    pa, pq = _pa
 
     table = pa.table(
         {
@@ -26,15 +34,14 @@ def sample_parquet(tmp_path):
         }
     )
 
-    path = tmp_path / "sample.parquet"
+    path = tmp_path_factory.mktemp("parquet") / "sample.parquet"
     pq.write_table(table, path)
     return path
 
 
-@pytest.fixture()
-def sample_parquet_with_page_index(tmp_path):
-    pa = pytest.importorskip("pyarrow")
-    pq = pytest.importorskip("pyarrow.parquet")
+@pytest.fixture(scope="session")
+def sample_parquet_with_page_index(_pa, tmp_path_factory):
+    pa, pq = _pa
 
     dict_array = pa.array(
         ["alpha", "beta", "gamma", "beta", "alpha"],
@@ -47,7 +54,7 @@ def sample_parquet_with_page_index(tmp_path):
         }
     )
 
-    path = tmp_path / "with-index.parquet"
+    path = tmp_path_factory.mktemp("parquet") / "with-index.parquet"
     pq.write_table(
         table,
         path,